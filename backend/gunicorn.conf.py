@@ -0,0 +1,14 @@
+# Gunicorn config for running the API behind a process manager.
+# Start from the backend directory with: gunicorn main:app -c gunicorn.conf.py
+import os
+
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Caches and queued jobs live in process memory, so running more than one
+# worker needs sticky routing for job polling to reach the right process
+workers = int(os.getenv("WORKERS", 1))
+
+# Video analysis can take minutes; match the frontend's 5 minute timeout
+timeout = 300
+keepalive = 75
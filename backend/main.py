@@ -1,26 +1,75 @@
 import os
-import base64
-from typing import Optional
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
-from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
+import io
+import json
+import mimetypes
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager, suppress
+from typing import BinaryIO, Optional, Union
+import httpx
+import pybase64
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from starlette.background import BackgroundTask
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
+from google import genai
+from google.genai import types
 import tempfile
 import aiofiles
+import aiofiles.os
+from prompts import ANALYSIS_OPTIONS, ANALYSIS_PARTS, SYSTEM_PROMPT
+from schemas import AnalysisJobResponse, VideoAnalysisRequest, VideoAnalysisResponse
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the periodic cleanup task for the lifetime of the app, stopping jobs and closing connections on shutdown"""
+    cleanup_task = asyncio.create_task(cleanup_loop())
+    yield
+    cleanup_task.cancel()
+    for task in background_tasks:
+        task.cancel()
+    with suppress(asyncio.CancelledError):
+        await cleanup_task
+    # Cancelled jobs still remove their saved uploads before they finish
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await http_client.aclose()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Video Interpreter",
     description="Analyze videos using Google's Gemini AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Upload limits. Request bodies get some headroom for multipart framing and
+# form fields; base64 bodies are 4/3 the size of the video they carry.
+MAX_VIDEO_SIZE = 50 * 1024 * 1024
+REQUEST_OVERHEAD = 64 * 1024
+REQUEST_SIZE_LIMITS = {
+    "/analyze-video": MAX_VIDEO_SIZE * 4 // 3 + REQUEST_OVERHEAD,
+    "/analyze-video-file": MAX_VIDEO_SIZE + REQUEST_OVERHEAD,
+    "/analyze-video-file/stream": MAX_VIDEO_SIZE + REQUEST_OVERHEAD,
+    "/analyze-video-jobs": MAX_VIDEO_SIZE + REQUEST_OVERHEAD
+}
+
+# Registered before the CORS middleware so rejections still carry CORS headers
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    """Reject oversized uploads from their Content-Length before reading the body"""
+    max_size = REQUEST_SIZE_LIMITS.get(request.url.path)
+    content_length = request.headers.get("content-length", "")
+    if max_size and content_length.isdigit() and int(content_length) > max_size:
+        return JSONResponse(status_code=413, content={"detail": "Video file too large (max 50MB)"})
+    return await call_next(request)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -30,49 +79,302 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the LLM
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash-exp", 
-    api_key=os.getenv("GEMINI_API_KEY")
+# Initialize the Gemini client with a pooled HTTP/2 async transport, so
+# concurrent requests share kept-alive connections instead of new TLS handshakes.
+# The httpx client is passed in directly because the SDK ignores
+# async_client_args when it picks aiohttp as its async transport.
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, keepalive_expiry=60)
 )
+client = genai.Client(
+    api_key=os.getenv("GEMINI_API_KEY"),
+    http_options=types.HttpOptions(httpx_async_client=http_client)
+)
+MODEL_NAME = "gemini-2.0-flash-exp"
 
-# Pydantic models
-class VideoAnalysisRequest(BaseModel):
-    analysis_type: str
-    video_base64: str
-    mime_type: str = "video/mp4"
-
-class VideoAnalysisResponse(BaseModel):
-    analysis_type: str
-    analysis_description: str
-    result: str
-    success: bool
-
-# Analysis options
-ANALYSIS_OPTIONS = {
-    "detailed_summary": "Give a detailed summary of this video. Include information about the setting, people involved, actions taking place, objects visible, and any dialogue or audio elements.",
-    "bullet_summary": "Summarize this video in a few short bullets. Focus on the key events and main points only.",
-    "timestamped_summary": "Generate a paragraph that summarizes this video, with corresponding timecodes. Break down what happens at different time intervals and provide a comprehensive overview.",
-    "quiz_generation": "Summarize this video in detail. Then create a quiz with 5-7 questions based on the information in this video. Include multiple choice, true/false, and short answer questions. Provide a complete answer key with explanations.",
-    "technical_analysis": "Analyze the technical aspects of this video including camera work, lighting, editing techniques, and overall production quality.",
-    "object_identification": "Identify and describe all the objects, people, and text visible in this video. Provide a comprehensive inventory of visual elements."
-}
+INVALID_ANALYSIS_TYPE_DETAIL = f"Invalid analysis type. Available options: {list(ANALYSIS_OPTIONS.keys())}"
 
-# Create prompt template
-prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are an expert video analyst. Analyze videos carefully and provide detailed descriptions."),
-    ("human", [
-        {
-            "type": "text",
-            "text": "{analysis_request}"
-        },
-        {
-            "type": "media",
-            "data": "{video_data}",
-            "mime_type": "{mime_type}"
-        }
-    ])
-])
+def validate_analysis_type(analysis_type: str):
+    """Reject analysis types that are not in ANALYSIS_OPTIONS"""
+    if analysis_type not in ANALYSIS_OPTIONS:
+        raise HTTPException(status_code=400, detail=INVALID_ANALYSIS_TYPE_DETAIL)
+
+def validate_video_mime_type(mime_type: Optional[str]):
+    """Reject MIME types that are not video types"""
+    if not mime_type or not mime_type.startswith('video/'):
+        raise HTTPException(status_code=400, detail="File must be a video")
+
+def get_upload_mime_type(file: UploadFile) -> str:
+    """Return the MIME type of an uploaded video, guessing from the filename if needed"""
+    mime_type = file.content_type or mimetypes.guess_type(file.filename or "")[0]
+    validate_video_mime_type(mime_type)
+    return mime_type
+
+# Generation config with the system prompt
+generation_config = types.GenerateContentConfig(
+    system_instruction=SYSTEM_PROMPT
+)
+
+# Videos are read in chunks
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# A video is either an open binary file or the path of a local file
+VideoSource = Union[BinaryIO, str]
+
+async def read_video_chunks(source):
+    """Read a video from an upload or async file in chunks, enforcing the size limit"""
+    total = 0
+    while chunk := await source.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > MAX_VIDEO_SIZE:
+            raise HTTPException(status_code=413, detail="Video file too large (max 50MB)")
+        yield chunk
+
+async def hash_video(source) -> str:
+    """Return the SHA-256 digest of a video read from an upload or async file"""
+    digest = hashlib.sha256()
+    async for chunk in read_video_chunks(source):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+async def hash_local_video(file_path: str) -> str:
+    """Return the SHA-256 digest of a local video, enforcing the size limit"""
+    async with aiofiles.open(file_path, "rb") as source:
+        return await hash_video(source)
+
+async def save_upload(file: UploadFile) -> tuple[str, str]:
+    """Copy an uploaded video to a named temp file, returning its path and SHA-256 digest"""
+    # Used when the video has to outlive the request; the caller removes the file
+    fd, video_path = tempfile.mkstemp(suffix=os.path.splitext(file.filename or "")[1])
+    os.close(fd)
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(video_path, "wb") as saved:
+            async for chunk in read_video_chunks(file):
+                digest.update(chunk)
+                await saved.write(chunk)
+    except BaseException:
+        await remove_saved_upload(video_path)
+        raise
+    return video_path, digest.hexdigest()
+
+async def remove_saved_upload(video_path: str):
+    """Delete a video saved by save_upload"""
+    with suppress(FileNotFoundError):
+        await aiofiles.os.remove(video_path)
+
+# Longest time to wait for Gemini to finish processing an uploaded video
+FILE_PROCESSING_TIMEOUT = 5 * 60
+
+async def upload_video(video_file: VideoSource, mime_type: str) -> types.File:
+    """Upload a video to the Gemini Files API and wait until it is ready"""
+    uploaded = await client.aio.files.upload(
+        file=video_file,
+        config=types.UploadFileConfig(mime_type=mime_type)
+    )
+    try:
+        async with asyncio.timeout(FILE_PROCESSING_TIMEOUT):
+            while uploaded.state == types.FileState.PROCESSING:
+                await asyncio.sleep(1)
+                uploaded = await client.aio.files.get(name=uploaded.name)
+    except TimeoutError:
+        await delete_video_file(uploaded.name)
+        raise RuntimeError(f"Video processing did not finish within {FILE_PROCESSING_TIMEOUT} seconds")
+    if uploaded.state == types.FileState.FAILED:
+        await delete_video_file(uploaded.name)
+        raise RuntimeError(f"Video processing failed: {uploaded.error}")
+    return uploaded
+
+async def delete_video_file(name: str):
+    """Delete an uploaded video from the Gemini Files API, ignoring failures"""
+    with suppress(Exception):
+        await client.aio.files.delete(name=name)
+
+# LRU cache of uploaded Gemini files keyed by video digest. The Files API keeps
+# uploads for 48 hours, so handles are reused for a little less than that, and
+# files are deleted from Gemini as soon as their handle is dropped.
+FILE_HANDLE_TTL = 47 * 60 * 60
+FILE_HANDLE_CACHE_SIZE = 100
+file_handles: OrderedDict[str, tuple[types.File, float]] = OrderedDict()
+
+# Uploads currently running, keyed by video digest, so concurrent requests for
+# the same video share a single upload
+inflight_uploads: dict[str, asyncio.Task] = {}
+
+async def store_video_file(video_digest: str, video_file: VideoSource, mime_type: str) -> types.File:
+    """Upload a video and keep its Gemini file for reuse"""
+    uploaded = await upload_video(video_file, mime_type)
+    file_handles[video_digest] = (uploaded, time.time() + FILE_HANDLE_TTL)
+    if len(file_handles) > FILE_HANDLE_CACHE_SIZE:
+        _, (evicted, _) = file_handles.popitem(last=False)
+        await delete_video_file(evicted.name)
+    return uploaded
+
+async def get_video_file(video_digest: str, video_file: VideoSource, mime_type: str) -> types.File:
+    """Return the uploaded Gemini file for a video, uploading it if needed"""
+    if video_digest in file_handles:
+        uploaded, expires_at = file_handles[video_digest]
+        if expires_at > time.time():
+            file_handles.move_to_end(video_digest)
+            return uploaded
+        del file_handles[video_digest]
+        await delete_video_file(uploaded.name)
+    
+    # Join an upload of the same video that is already running, and upload
+    # this caller's video if the shared upload fails, as run_analysis does
+    if video_digest in inflight_uploads:
+        with suppress(Exception):
+            return await asyncio.shield(inflight_uploads[video_digest])
+    if video_digest not in inflight_uploads:
+        task = asyncio.create_task(store_video_file(video_digest, video_file, mime_type))
+        inflight_uploads[video_digest] = task
+        task.add_done_callback(lambda _: inflight_uploads.pop(video_digest, None))
+    return await asyncio.shield(inflight_uploads[video_digest])
+
+# LRU cache of analysis results keyed by video digest and analysis type
+RESPONSE_CACHE_SIZE = 256
+response_cache: OrderedDict[str, str] = OrderedDict()
+
+# Analyses currently running on Gemini, keyed like the response cache, so
+# identical concurrent requests share a single call
+inflight_analyses: dict[str, asyncio.Task] = {}
+
+def cache_result(cache_key: str, result: str):
+    """Store an analysis result, evicting the least recently used one when full"""
+    response_cache[cache_key] = result
+    if len(response_cache) > RESPONSE_CACHE_SIZE:
+        response_cache.popitem(last=False)
+
+async def build_contents(analysis_type: str, video_digest: str, video_file: VideoSource, mime_type: str) -> list:
+    """Build the Gemini request contents for an analysis"""
+    # Reference the video through the Files API instead of inlining it in the
+    # request, so other analyses of the same video skip the upload. The video
+    # goes before the analysis request, the ordering Gemini recommends for
+    # video prompts; gemini-2.0-flash-exp does no context caching, so repeated
+    # analyses are served from response_cache instead.
+    uploaded = await get_video_file(video_digest, video_file, mime_type)
+    return [
+        types.Part.from_uri(file_uri=uploaded.uri, mime_type=mime_type),
+        ANALYSIS_PARTS[analysis_type]
+    ]
+
+async def generate_analysis(cache_key: str, analysis_type: str, video_digest: str, video_file: VideoSource, mime_type: str) -> str:
+    """Run the analysis on Gemini and cache the result"""
+    response = await client.aio.models.generate_content(
+        model=MODEL_NAME,
+        contents=await build_contents(analysis_type, video_digest, video_file, mime_type),
+        config=generation_config
+    )
+    # Gemini returns no text when a response is blocked; never cache that
+    if not response.text:
+        raise RuntimeError("Gemini returned no analysis text")
+    cache_result(cache_key, response.text)
+    return response.text
+
+async def run_analysis(analysis_type: str, video_digest: str, video_file: VideoSource, mime_type: str) -> str:
+    """Run the analysis, reusing cached or in-flight results for repeated videos"""
+    cache_key = f"{video_digest}:{analysis_type}"
+    if cache_key in response_cache:
+        response_cache.move_to_end(cache_key)
+        return response_cache[cache_key]
+    
+    # Join an identical analysis that is already running. The shield keeps a
+    # cancelled caller from cancelling the shared call, but the call reads the
+    # video of the caller that started it, which that caller closes when it
+    # goes away. If the shared call fails, run it again with this caller's video.
+    if cache_key in inflight_analyses:
+        with suppress(Exception):
+            return await asyncio.shield(inflight_analyses[cache_key])
+    if cache_key not in inflight_analyses:
+        task = asyncio.create_task(
+            generate_analysis(cache_key, analysis_type, video_digest, video_file, mime_type)
+        )
+        inflight_analyses[cache_key] = task
+        task.add_done_callback(lambda _: inflight_analyses.pop(cache_key, None))
+    return await asyncio.shield(inflight_analyses[cache_key])
+
+def format_event(data: dict, event: Optional[str] = None) -> str:
+    """Format a server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+async def stream_analysis(analysis_type: str, video_digest: str, video_file: VideoSource, mime_type: str):
+    """Stream the analysis from Gemini as server-sent events"""
+    try:
+        cache_key = f"{video_digest}:{analysis_type}"
+        if cache_key in response_cache:
+            response_cache.move_to_end(cache_key)
+            yield format_event({"delta": response_cache[cache_key]})
+        else:
+            deltas = []
+            stream = await client.aio.models.generate_content_stream(
+                model=MODEL_NAME,
+                contents=await build_contents(analysis_type, video_digest, video_file, mime_type),
+                config=generation_config
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    deltas.append(chunk.text)
+                    yield format_event({"delta": chunk.text})
+            if not deltas:
+                raise RuntimeError("Gemini returned no analysis text")
+            cache_result(cache_key, "".join(deltas))
+        yield format_event({"success": True}, event="done")
+    except Exception as e:
+        yield format_event({"detail": f"Analysis failed: {str(e)}"}, event="error")
+
+# Background analysis jobs keyed by job id
+analysis_jobs: dict[str, dict] = {}
+background_tasks: set[asyncio.Task] = set()
+
+# At most MAX_CONCURRENT_JOBS jobs run at once; the rest stay pending. A failed
+# analysis is retried up to JOB_MAX_RETRIES times with exponential backoff.
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", 4))
+JOB_MAX_RETRIES = 3
+job_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+
+async def run_analysis_job(job_id: str, video_digest: str, video_path: str, mime_type: str):
+    """Run a queued analysis once a job slot is free and record its outcome on the job"""
+    job = analysis_jobs[job_id]
+    try:
+        async with job_slots:
+            job["status"] = "running"
+            for attempt in range(JOB_MAX_RETRIES + 1):
+                try:
+                    job["result"] = await run_analysis(job["analysis_type"], video_digest, video_path, mime_type)
+                    break
+                except Exception:
+                    if attempt == JOB_MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(2 ** attempt)
+        job["status"] = "completed"
+    except Exception as e:
+        job["error"] = f"Analysis failed: {str(e)}"
+        job["status"] = "failed"
+    finally:
+        job["finished_at"] = time.time()
+        await remove_saved_upload(video_path)
+
+# Expired file handles and finished jobs older than JOB_RETENTION are evicted
+# every CLEANUP_INTERVAL seconds so they do not accumulate under load
+CLEANUP_INTERVAL = 5 * 60
+JOB_RETENTION = 30 * 60
+
+async def cleanup_loop():
+    """Periodically evict expired file handles and old finished jobs"""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        now = time.time()
+        expired_files = []
+        for video_digest, (uploaded, expires_at) in list(file_handles.items()):
+            if expires_at <= now:
+                del file_handles[video_digest]
+                expired_files.append(uploaded.name)
+        await asyncio.gather(*(delete_video_file(name) for name in expired_files))
+        for job_id, job in list(analysis_jobs.items()):
+            if now - job.get("finished_at", now) > JOB_RETENTION:
+                del analysis_jobs[job_id]
 
 @app.get("/")
 async def root():
@@ -83,6 +385,9 @@ async def root():
         "endpoints": {
             "analyze_video": "/analyze-video",
             "analyze_video_file": "/analyze-video-file",
+            "analyze_video_file_stream": "/analyze-video-file/stream",
+            "create_analysis_job": "/analyze-video-jobs",
+            "get_analysis_job": "/analyze-video-jobs/{job_id}",
             "get_analysis_options": "/analysis-options"
         }
     }
@@ -104,34 +409,37 @@ async def get_analysis_options():
 async def analyze_video(request: VideoAnalysisRequest):
     """Analyze video from base64 encoded data"""
     try:
+        # Validate file type
+        validate_video_mime_type(request.mime_type)
+        
         # Validate analysis type
-        if request.analysis_type not in ANALYSIS_OPTIONS:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid analysis type. Available options: {list(ANALYSIS_OPTIONS.keys())}"
-            )
+        validate_analysis_type(request.analysis_type)
         
-        # Create chain
-        chain = prompt | llm
+        # Decode video data
+        try:
+            video_content = pybase64.b64decode(request.video_base64)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid base64 video data")
+        if len(video_content) > MAX_VIDEO_SIZE:
+            raise HTTPException(status_code=413, detail="Video file too large (max 50MB)")
         
-        # Invoke the chain
-        response = chain.invoke({
-            "analysis_request": ANALYSIS_OPTIONS[request.analysis_type],
-            "video_data": request.video_base64,
-            "mime_type": request.mime_type
-        })
+        # Run the analysis
+        video_digest = hashlib.sha256(video_content).hexdigest()
+        result = await run_analysis(request.analysis_type, video_digest, io.BytesIO(video_content), request.mime_type)
         
         return VideoAnalysisResponse(
             analysis_type=request.analysis_type,
             analysis_description=ANALYSIS_OPTIONS[request.analysis_type],
-            result=response.content,
+            result=result,
             success=True
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
-@app.post("/analyze-video-file")
+@app.post("/analyze-video-file", response_model=VideoAnalysisResponse)
 async def analyze_video_file(
     file: UploadFile = File(...),
     analysis_type: str = Form(...)
@@ -139,41 +447,86 @@ async def analyze_video_file(
     """Analyze video from uploaded file"""
     try:
         # Validate file type
-        if not file.content_type.startswith('video/'):
-            raise HTTPException(status_code=400, detail="File must be a video")
+        mime_type = get_upload_mime_type(file)
         
         # Validate analysis type
-        if analysis_type not in ANALYSIS_OPTIONS:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid analysis type. Available options: {list(ANALYSIS_OPTIONS.keys())}"
-            )
-        
-        # Read and encode video file
-        video_content = await file.read()
-        encoded_video = base64.b64encode(video_content).decode()
-        
-        # Create chain
-        chain = prompt | llm
+        validate_analysis_type(analysis_type)
         
-        # Invoke the chain
-        response = chain.invoke({
-            "analysis_request": ANALYSIS_OPTIONS[analysis_type],
-            "video_data": encoded_video,
-            "mime_type": file.content_type
-        })
+        # Hash the upload in place and analyze Starlette's spooled file directly
+        video_digest = await hash_video(file)
+        await file.seek(0)
+        result = await run_analysis(analysis_type, video_digest, file.file, mime_type)
         
         return VideoAnalysisResponse(
             analysis_type=analysis_type,
             analysis_description=ANALYSIS_OPTIONS[analysis_type],
-            result=response.content,
+            result=result,
             success=True
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
-@app.post("/analyze-local-video")
+@app.post("/analyze-video-file/stream")
+async def analyze_video_file_stream(
+    file: UploadFile = File(...),
+    analysis_type: str = Form(...)
+):
+    """Analyze video from uploaded file, streaming the result as server-sent events"""
+    # Validate file type
+    mime_type = get_upload_mime_type(file)
+    
+    # Validate analysis type
+    validate_analysis_type(analysis_type)
+    
+    # Save the upload now, it is closed once the response starts. The saved
+    # copy is removed after the response, even if it is never streamed.
+    video_path, video_digest = await save_upload(file)
+    
+    return StreamingResponse(
+        stream_analysis(analysis_type, video_digest, video_path, mime_type),
+        media_type="text/event-stream",
+        background=BackgroundTask(remove_saved_upload, video_path)
+    )
+
+@app.post("/analyze-video-jobs", response_model=AnalysisJobResponse, status_code=202)
+async def create_analysis_job(
+    file: UploadFile = File(...),
+    analysis_type: str = Form(...)
+):
+    """Queue analysis of an uploaded video and return a job id to poll"""
+    # Validate file type
+    mime_type = get_upload_mime_type(file)
+    
+    # Validate analysis type
+    validate_analysis_type(analysis_type)
+    
+    # Save the upload now, it is closed once the response is sent
+    video_path, video_digest = await save_upload(file)
+    
+    # Queue the analysis
+    job_id = uuid.uuid4().hex
+    analysis_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "pending",
+        "analysis_type": analysis_type
+    }
+    task = asyncio.create_task(run_analysis_job(job_id, video_digest, video_path, mime_type))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    
+    return analysis_jobs[job_id]
+
+@app.get("/analyze-video-jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(job_id: str):
+    """Get the status and result of a queued analysis"""
+    if job_id not in analysis_jobs:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return analysis_jobs[job_id]
+
+@app.post("/analyze-local-video", response_model=VideoAnalysisResponse)
 async def analyze_local_video(
     file_path: str = Form(...),
     analysis_type: str = Form(...)
@@ -181,37 +534,31 @@ async def analyze_local_video(
     """Analyze video from local file path (for development/testing)"""
     try:
         # Validate analysis type
-        if analysis_type not in ANALYSIS_OPTIONS:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid analysis type. Available options: {list(ANALYSIS_OPTIONS.keys())}"
-            )
+        validate_analysis_type(analysis_type)
         
         # Check if file exists
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="Video file not found")
         
-        # Read and encode video file
-        with open(file_path, "rb") as video_file:
-            encoded_video = base64.b64encode(video_file.read()).decode()
+        # Validate file type, detected from the extension
+        mime_type = mimetypes.guess_type(file_path)[0]
+        validate_video_mime_type(mime_type)
         
-        # Create chain
-        chain = prompt | llm
+        # Hash video file; the SDK reads it from the path asynchronously
+        video_digest = await hash_local_video(file_path)
         
-        # Invoke the chain
-        response = chain.invoke({
-            "analysis_request": ANALYSIS_OPTIONS[analysis_type],
-            "video_data": encoded_video,
-            "mime_type": "video/mp4"  # Default to mp4, could be enhanced to detect actual type
-        })
+        # Run the analysis
+        result = await run_analysis(analysis_type, video_digest, file_path, mime_type)
         
         return VideoAnalysisResponse(
             analysis_type=analysis_type,
             analysis_description=ANALYSIS_OPTIONS[analysis_type],
-            result=response.content,
+            result=result,
             success=True
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
@@ -222,4 +569,13 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Caches and queued jobs live in process memory, so running more than one
+    # worker needs sticky routing for job polling to reach the right process
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WORKERS", 1)),
+        loop="auto",  # uvloop where installed; uvicorn[standard] skips it on Windows
+        http="httptools"
+    )
\ No newline at end of file
@@ -0,0 +1,21 @@
+from typing import Final
+from google.genai import types
+
+# System prompt
+SYSTEM_PROMPT: Final = "You are an expert video analyst. Analyze videos carefully and provide detailed descriptions."
+
+# Analysis options
+ANALYSIS_OPTIONS: Final[dict[str, str]] = {
+    "detailed_summary": "Give a detailed summary of this video. Include information about the setting, people involved, actions taking place, objects visible, and any dialogue or audio elements.",
+    "bullet_summary": "Summarize this video in a few short bullets. Focus on the key events and main points only.",
+    "timestamped_summary": "Generate a paragraph that summarizes this video, with corresponding timecodes. Break down what happens at different time intervals and provide a comprehensive overview.",
+    "quiz_generation": "Summarize this video in detail. Then create a quiz with 5-7 questions based on the information in this video. Include multiple choice, true/false, and short answer questions. Provide a complete answer key with explanations.",
+    "technical_analysis": "Analyze the technical aspects of this video including camera work, lighting, editing techniques, and overall production quality.",
+    "object_identification": "Identify and describe all the objects, people, and text visible in this video. Provide a comprehensive inventory of visual elements."
+}
+
+# Prebuilt analysis request parts, so each request only adds the video part
+ANALYSIS_PARTS: Final[dict[str, types.Part]] = {
+    key: types.Part.from_text(text=value)
+    for key, value in ANALYSIS_OPTIONS.items()
+}
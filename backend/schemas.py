@@ -0,0 +1,27 @@
+from typing import Optional
+from pydantic import BaseModel
+
+# Pydantic models
+class VideoAnalysisRequest(BaseModel):
+    model_config = {"frozen": True}
+
+    analysis_type: str
+    video_base64: str
+    mime_type: str = "video/mp4"
+
+class VideoAnalysisResponse(BaseModel):
+    model_config = {"frozen": True}
+
+    analysis_type: str
+    analysis_description: str
+    result: str
+    success: bool
+
+class AnalysisJobResponse(BaseModel):
+    model_config = {"frozen": True}
+
+    job_id: str
+    status: str
+    analysis_type: str
+    result: Optional[str] = None
+    error: Optional[str] = None